@@ -17,44 +17,261 @@ Usage:
 """
 
 import argparse
-import json
+import base64
+import hashlib
+import hmac
 import os
+import secrets
+import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+import orjson
+from dotenv import dotenv_values
+
+# The Azure CLI is resolved once (az.cmd on Windows) and run without a
+# shell, so arguments reach it unquoted and no cmd/sh is started per call
+AZ_CLI = shutil.which("az") or "az"
+
+# Independent az commands run concurrently; each spends its time waiting
+# on Azure, so threads are enough
+MAX_PARALLEL_COMMANDS = 8
+
+# Provisioning state is polled with exponential backoff until it settles
+PROVISIONING_TIMEOUT = 120.0
+PROVISIONING_POLL_INITIAL = 2.0
+PROVISIONING_POLL_MAX = 8.0
+# Creates submitted with --no-wait (only where az supports it) are polled
+# after the other steps; a new Search service can take many minutes
+NO_WAIT_TIMEOUT = 1800.0
+
+# az commands that show a resource by type, filled in per lookup
+EXISTS_COMMANDS: Dict[str, Tuple[str, ...]] = {
+    "group": ("group", "show", "--name", "{name}"),
+    "cognitiveservices": (
+        "cognitiveservices",
+        "account",
+        "show",
+        "--name",
+        "{name}",
+        "--resource-group",
+        "{rg}",
+    ),
+    "search": (
+        "search",
+        "service",
+        "show",
+        "--name",
+        "{name}",
+        "--resource-group",
+        "{rg}",
+    ),
+    "keyvault": (
+        "keyvault",
+        "show",
+        "--name",
+        "{name}",
+        "--resource-group",
+        "{rg}",
+    ),
+    "appconfig": (
+        "appconfig",
+        "show",
+        "--name",
+        "{name}",
+        "--resource-group",
+        "{rg}",
+    ),
+    "loganalytics": (
+        "monitor",
+        "log-analytics",
+        "workspace",
+        "show",
+        "--workspace-name",
+        "{name}",
+        "--resource-group",
+        "{rg}",
+    ),
+    "acr": ("acr", "show", "--name", "{name}", "--resource-group", "{rg}"),
+    "storage": (
+        "storage",
+        "account",
+        "show",
+        "--name",
+        "{name}",
+        "--resource-group",
+        "{rg}",
+    ),
+    "appinsights": (
+        "monitor",
+        "app-insights",
+        "component",
+        "show",
+        "--app",
+        "{name}",
+        "--resource-group",
+        "{rg}",
+    ),
+    "ml": (
+        "ml",
+        "workspace",
+        "show",
+        "--name",
+        "{name}",
+        "--resource-group",
+        "{rg}",
+    ),
+    "appservice-plan": (
+        "appservice",
+        "plan",
+        "show",
+        "--name",
+        "{name}",
+        "--resource-group",
+        "{rg}",
+    ),
+    "webapp": (
+        "webapp",
+        "show",
+        "--name",
+        "{name}",
+        "--resource-group",
+        "{rg}",
+    ),
+    "identity": (
+        "identity",
+        "show",
+        "--name",
+        "{name}",
+        "--resource-group",
+        "{rg}",
+    ),
+}
+
+# Key Vault configuration values that do not depend on the deployment
+FIXED_CONFIG: Tuple[Tuple[str, str], ...] = (
+    # === TRANSLATOR ===
+    ("translator-endpoint", "https://api.cognitive.microsofttranslator.com/"),
+    # === AZURE OPENAI CONFIGURATION ===
+    ("azure-openai-api-version", "2024-02-01"),
+    ("azure-openai-deployment-gpt", "gpt-4o-mini"),
+    ("azure-openai-deployment-embedding", "text-embedding-ada-002"),
+    ("azure-openai-deployment-whisper", "whisper"),
+    ("azure-openai-deployment-tts", "tts-1"),
+    # === APPLICATION SECRETS ===
+    ("flask-secret-key", "your-secure-secret-key-change-this-in-production"),
+)
+
+# Tag holding a keyed hash of each secret's value, so one secret listing
+# shows which values are unchanged. The key stays in a local file and
+# never goes to Key Vault, so the tag cannot be used to test guesses.
+SECRET_HASH_TAG = "value_hmac"
+SECRET_HASH_KEY_FILE = ".keyvault-hash.key"
+
+# Parsed JSON output of an az command
+AzResult = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+# How long answers to read-only az commands may be reused
+READ_CACHE_TTL = 300.0
+
+# ARM resource types (lower-cased) for the resource_exists() type names
+ARM_RESOURCE_TYPES = {
+    "microsoft.cognitiveservices/accounts": "cognitiveservices",
+    "microsoft.search/searchservices": "search",
+    "microsoft.keyvault/vaults": "keyvault",
+    "microsoft.appconfiguration/configurationstores": "appconfig",
+    "microsoft.operationalinsights/workspaces": "loganalytics",
+    "microsoft.containerregistry/registries": "acr",
+    "microsoft.storage/storageaccounts": "storage",
+    "microsoft.insights/components": "appinsights",
+    "microsoft.machinelearningservices/workspaces": "ml",
+    "microsoft.web/serverfarms": "appservice-plan",
+    "microsoft.web/sites": "webapp",
+    "microsoft.managedidentity/userassignedidentities": "identity",
+}
 
 
 # Load environment variables from .env file if it exists
 def load_env_file(env_path: str = ".env") -> None:
     """Load environment variables from .env file"""
-    env_file = Path(env_path)
-    if env_file.exists():
-        with open(env_file, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip().strip('"').strip("'")
-                    os.environ[key] = value
+    # dotenv_values also handles quoting, escapes and 'export' prefixes;
+    # keys without a value are left out, as before
+    values = dotenv_values(env_path)
+    os.environ.update(
+        {key: value for key, value in values.items() if value is not None}
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class DeployConfig:
+    """Names and location of the resources to deploy"""
+
+    resource_group: str
+    location: str
+    project_tag: str
+    ai_services_name: str
+    openai_service_name: str
+    cognitive_search_name: str
+    keyvault_name: str
+    appconfig_name: str
+    log_workspace_name: str
+    container_registry_name: str
+    storage_account_name: str
+    application_insights_name: str
+    ml_workspace_name: str
+    app_service_plan_name: str
+    web_app_name: str
 
 
 class AzureAIFoundryDeployer:
     """Azure AI Foundry project deployment manager"""
 
+    # Shared by every deployer in the process once the check has passed
+    ml_extension_ready = False
+
     def __init__(
         self,
-        config: Dict[str, Any],
+        config: DeployConfig,
         dry_run: bool = False,
         verbose: bool = False,
     ):
         self.config = config
         self.dry_run = dry_run
         self.verbose = verbose
+        # Appended to from several deployment threads at once
         self.created_resources: List[str] = []
         self.existing_resources: List[str] = []
+        self.output_lock = threading.Lock()
+        # Names of the resource group's resources by type, listed once
+        self.existing_names: Optional[Dict[str, Set[str]]] = None
+        self.existing_listed = False
+        self.existing_lock = threading.Lock()
+        # Recent answers to read-only az commands, by argument list
+        self.read_cache: Dict[Tuple[str, ...], Tuple[float, AzResult]] = {}
+        self.read_cache_lock = threading.Lock()
+        # (type, name, display name) of creates submitted with --no-wait
+        self.pending_resources: List[Tuple[str, str, str]] = []
+        # Looked up on first use; neither changes during a run
+        self.subscription_id: Optional[str] = None
+        self.user_object_id: Optional[str] = None
+        self.account_ids_loaded = False
+        self.logged_in = False
+        self.account_lock = threading.Lock()
+        # Managed identity created for the applications, if any
+        self.app_identity_name: Optional[str] = None
+        self.app_identity_principal_id: Optional[str] = None
 
     def get_dict_value(
         self,
@@ -64,12 +281,12 @@ class AzureAIFoundryDeployer:
         """Safely get a value from a dictionary result, nested keys"""
         if isinstance(data, dict):
             keys = key.split(".")
-            current = data
+            current: Any = data
             for k in keys:
-                if isinstance(current, dict) and k in current:
-                    current = current[k]
-                else:
+                if not isinstance(current, dict):
                     return ""
+                # A missing key reads as None, which maps to "" below
+                current = current.get(k)
             return str(current) if current is not None else ""
         return ""
 
@@ -97,44 +314,105 @@ class AzureAIFoundryDeployer:
             "CREATE": "🔨",
         }
 
-        print(f"{prefix.get(level, '📝')} {message}")
-        if self.verbose and level in ["CREATE", "SUCCESS"]:
-            print(f"   └─ Resource: {message}")
+        with self.output_lock:
+            print(f"{prefix.get(level, '📝')} {message}")
+            if self.verbose and level in ["CREATE", "SUCCESS"]:
+                print(f"   └─ Resource: {message}")
 
     def run_az_command(
-        self, command: List[str], check_exists: bool = False
-    ) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        self,
+        command: List[str],
+        check_exists: bool = False,
+        cached: bool = False,
+    ) -> Optional[AzResult]:
         """Execute Azure CLI command with error handling"""
         if self.dry_run and not check_exists:
             self.log(f"DRY RUN: az {' '.join(command)}", "INFO")
             return {"dry_run": True}
 
+        # Reads marked as cacheable reuse a recent successful answer
+        key = tuple(command)
+        if cached:
+            with self.read_cache_lock:
+                hit = self.read_cache.get(key)
+            if hit is not None and time.monotonic() - hit[0] < READ_CACHE_TTL:
+                return hit[1]
+
+        result = self.invoke_az(command, check_exists)
+        if cached and result is not None:
+            with self.read_cache_lock:
+                self.read_cache[key] = (time.monotonic(), result)
+        return result
+
+    def invoke_az(
+        self, command: List[str], check_exists: bool
+    ) -> Optional[AzResult]:
+        """Run one Azure CLI command and parse its JSON output"""
+
         try:
             if self.verbose:
                 self.log(f"Running: az {' '.join(command)}", "INFO")
 
-            result = subprocess.run(
-                ["az"] + command,
-                capture_output=True,
-                text=True,
-                check=True,
-                shell=True,
-            )
-
-            if result.stdout.strip():
-                parsed_result: Union[Dict[str, Any], List[Dict[str, Any]]] = (
-                    json.loads(result.stdout)
-                )
-                return parsed_result  # Return the actual result (dict or list)
-            return {}
+            # Output stays as bytes: orjson parses them directly, so no
+            # decoded copy of a large response is held next to the parse
+            result = subprocess.run([AZ_CLI, *command], capture_output=True)
+        except OSError as e:
+            self.log(f"Could not run Azure CLI: {e}", "ERROR")
+            return None
 
-        except subprocess.CalledProcessError as e:
-            if check_exists and "not found" in e.stderr.lower():
+        # A missing resource is an expected answer for existence checks,
+        # so failures are told apart by exit code rather than exceptions
+        if result.returncode != 0:
+            # az says either "not found" or "could not be found"
+            error = result.stderr.lower()
+            if check_exists and (
+                b"not found" in error or b"could not be found" in error
+            ):
                 return None
-            self.log(f"Command failed: {e.stderr}", "ERROR")
+            stderr = result.stderr.decode(errors="replace")
+            self.log(f"Command failed: {stderr}", "ERROR")
             return None
-        except json.JSONDecodeError:
+
+        if not result.stdout.strip():
+            return {}
+        try:
+            parsed_result: AzResult = orjson.loads(result.stdout)
+        except orjson.JSONDecodeError:
             return {"success": True}
+        return parsed_result  # Return the actual result (dict or list)
+
+    def list_existing_resources(self) -> Optional[Dict[str, Set[str]]]:
+        """List the resource group's resources with a single az call"""
+        with self.existing_lock:
+            if not self.existing_listed:
+                self.existing_listed = True
+                rg = self.config.resource_group
+                result = self.run_az_command(
+                    [
+                        "resource",
+                        "list",
+                        "--resource-group",
+                        rg,
+                        "--query",
+                        "[].{name:name, type:type}",
+                    ],
+                    check_exists=True,
+                )
+                if isinstance(result, list):
+                    names: Dict[str, Set[str]] = {}
+                    for item in result:
+                        resource_type = ARM_RESOURCE_TYPES.get(
+                            str(item.get("type", "")).lower()
+                        )
+                        if resource_type:
+                            names.setdefault(resource_type, set()).add(
+                                str(item.get("name", "")).lower()
+                            )
+                    self.existing_names = names
+                elif not self.resource_exists("group", rg):
+                    # A group that does not exist yet has no resources
+                    self.existing_names = {}
+            return self.existing_names
 
     def resource_exists(
         self,
@@ -143,122 +421,42 @@ class AzureAIFoundryDeployer:
         resource_group: Optional[str] = None,
     ) -> bool:
         """Check if Azure resource exists"""
-        rg = resource_group or self.config["resource_group"]
-
-        commands = {
-            "group": ["group", "show", "--name", name],
-            "cognitiveservices": [
-                "cognitiveservices",
-                "account",
-                "show",
-                "--name",
-                name,
-                "--resource-group",
-                rg,
-            ],
-            "search": [
-                "search",
-                "service",
-                "show",
-                "--name",
-                name,
-                "--resource-group",
-                rg,
-            ],
-            "keyvault": [
-                "keyvault",
-                "show",
-                "--name",
-                name,
-                "--resource-group",
-                rg,
-            ],
-            "appconfig": [
-                "appconfig",
-                "show",
-                "--name",
-                name,
-                "--resource-group",
-                rg,
-            ],
-            "loganalytics": [
-                "monitor",
-                "log-analytics",
-                "workspace",
-                "show",
-                "--workspace-name",
-                name,
-                "--resource-group",
-                rg,
-            ],
-            "acr": ["acr", "show", "--name", name, "--resource-group", rg],
-            "storage": [
-                "storage",
-                "account",
-                "show",
-                "--name",
-                name,
-                "--resource-group",
-                rg,
-            ],
-            "appinsights": [
-                "monitor",
-                "app-insights",
-                "component",
-                "show",
-                "--app",
-                name,
-                "--resource-group",
-                rg,
-            ],
-            "ml": [
-                "ml",
-                "workspace",
-                "show",
-                "--name",
-                name,
-                "--resource-group",
-                rg,
-            ],
-            "appservice-plan": [
-                "appservice",
-                "plan",
-                "show",
-                "--name",
-                name,
-                "--resource-group",
-                rg,
-            ],
-            "webapp": [
-                "webapp",
-                "show",
-                "--name",
-                name,
-                "--resource-group",
-                rg,
-            ],
-            "identity": [
-                "identity",
-                "show",
-                "--name",
-                name,
-                "--resource-group",
-                rg,
-            ],
-        }
+        rg = resource_group or self.config.resource_group
 
-        if resource_type not in commands:
+        template = EXISTS_COMMANDS.get(resource_type)
+        if template is None:
             self.log(f"Unknown resource type: {resource_type}", "ERROR")
             return False
 
+        # Answer from one listing of the resource group rather than an az
+        # show per resource; the group itself must exist to be listed, so
+        # it is still probed directly
+        if resource_type != "group" and rg == self.config.resource_group:
+            existing = self.list_existing_resources()
+            if existing is not None:
+                return name.lower() in existing.get(resource_type, set())
+
         result = self.run_az_command(
-            commands[resource_type], check_exists=True
+            self.show_command(resource_type, name, rg), check_exists=True
         )
         return result is not None
 
+    def show_command(
+        self,
+        resource_type: str,
+        name: str,
+        resource_group: Optional[str] = None,
+    ) -> List[str]:
+        """Build the az command that shows a resource of the given type"""
+        rg = resource_group or self.config.resource_group
+        return [
+            part.format(name=name, rg=rg)
+            for part in EXISTS_COMMANDS[resource_type]
+        ]
+
     def create_resource_group(self) -> bool:
         """Create resource group if it doesn't exist"""
-        name = self.config["resource_group"]
+        name = self.config.resource_group
 
         if self.resource_exists("group", name):
             self.log(f"Resource group '{name}' already exists", "SKIP")
@@ -273,9 +471,9 @@ class AzureAIFoundryDeployer:
                 "--name",
                 name,
                 "--location",
-                self.config["location"],
+                self.config.location,
                 "--tags",
-                f"project={self.config['project_tag']}",
+                f"project={self.config.project_tag}",
             ]
         )
 
@@ -289,7 +487,7 @@ class AzureAIFoundryDeployer:
 
     def create_general_ai_services(self) -> bool:
         """Create general AI services (for Speech, Translation, etc.)"""
-        name = self.config["ai_services_name"]
+        name = self.config.ai_services_name
 
         if self.resource_exists("cognitiveservices", name):
             self.log(f"General AI Services '{name}' already exists", "SKIP")
@@ -305,9 +503,9 @@ class AzureAIFoundryDeployer:
                 "--name",
                 name,
                 "--resource-group",
-                self.config["resource_group"],
+                self.config.resource_group,
                 "--location",
-                self.config["location"],
+                self.config.location,
                 "--kind",
                 "AIServices",
                 "--sku",
@@ -315,7 +513,7 @@ class AzureAIFoundryDeployer:
                 "--custom-domain",
                 name,
                 "--tags",
-                f"project={self.config['project_tag']}",
+                f"project={self.config.project_tag}",
             ]
         )
 
@@ -329,7 +527,7 @@ class AzureAIFoundryDeployer:
 
     def create_openai_service(self) -> bool:
         """Create dedicated OpenAI service"""
-        name = self.config["openai_service_name"]
+        name = self.config.openai_service_name
 
         if self.resource_exists("cognitiveservices", name):
             self.log(f"OpenAI Service '{name}' already exists", "SKIP")
@@ -345,9 +543,9 @@ class AzureAIFoundryDeployer:
                 "--name",
                 name,
                 "--resource-group",
-                self.config["resource_group"],
+                self.config.resource_group,
                 "--location",
-                self.config["location"],
+                self.config.location,
                 "--kind",
                 "OpenAI",
                 "--sku",
@@ -355,7 +553,7 @@ class AzureAIFoundryDeployer:
                 "--custom-domain",
                 name,
                 "--tags",
-                f"project={self.config['project_tag']}",
+                f"project={self.config.project_tag}",
             ]
         )
 
@@ -364,15 +562,57 @@ class AzureAIFoundryDeployer:
                 f"OpenAI Service '{name}' created successfully", "SUCCESS"
             )
             self.created_resources.append(f"OpenAI Service: {name}")
-            # Wait a moment for the service to be ready
-            if not self.dry_run:
-                time.sleep(10)
-            return True
+            return self.wait_for_provisioning(
+                self.show_command("cognitiveservices", name),
+                f"OpenAI Service '{name}'",
+            )
         return False
 
+    def wait_for_provisioning(
+        self,
+        show_command: List[str],
+        display_name: str,
+        timeout: float = PROVISIONING_TIMEOUT,
+    ) -> bool:
+        """Poll a resource's provisioningState until it has succeeded"""
+        if self.dry_run:
+            return True
+
+        deadline = time.monotonic() + timeout
+        delay = PROVISIONING_POLL_INITIAL
+        while True:
+            # A resource created with --no-wait may not be visible yet, so
+            # "not found" is just another pending answer
+            result = self.run_az_command(
+                [
+                    *show_command,
+                    "--query",
+                    "{state: properties.provisioningState"
+                    " || provisioningState}",
+                ],
+                check_exists=True,
+            )
+            # Some services, such as Search, report the state in lowercase
+            state = self.get_dict_value(result, "state")
+            if state.lower() == "succeeded":
+                return True
+            if state.lower() in ("failed", "canceled"):
+                self.log(
+                    f"{display_name} provisioning ended as '{state}'", "ERROR"
+                )
+                return False
+            if time.monotonic() + delay > deadline:
+                self.log(
+                    f"{display_name} still not ready after {timeout:.0f}s",
+                    "ERROR",
+                )
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, PROVISIONING_POLL_MAX)
+
     def verify_general_ai_services_capabilities(self) -> bool:
         """Verify that general AI services are properly configured"""
-        ai_services_name = self.config["ai_services_name"]
+        ai_services_name = self.config.ai_services_name
 
         if self.dry_run:
             self.log(
@@ -392,8 +632,11 @@ class AzureAIFoundryDeployer:
                 "--name",
                 ai_services_name,
                 "--resource-group",
-                self.config["resource_group"],
-            ]
+                self.config.resource_group,
+                "--query",
+                "{endpoint: properties.endpoint}",
+            ],
+            cached=True,
         )
 
         if service_info:
@@ -422,7 +665,7 @@ class AzureAIFoundryDeployer:
                 self.log(f"  ✓ {capability} (built-in)", "SUCCESS")
 
             # Note about OpenAI service
-            openai_service_name = self.config["openai_service_name"]
+            openai_service_name = self.config.openai_service_name
             self.log(
                 f"OpenAI Service '{openai_service_name}' is ready for "
                 f"model deployments",
@@ -440,7 +683,7 @@ class AzureAIFoundryDeployer:
 
     def create_cognitive_search(self) -> bool:
         """Create Cognitive Search service"""
-        name = self.config["cognitive_search_name"]
+        name = self.config.cognitive_search_name
 
         if self.resource_exists("search", name):
             self.log(f"Cognitive Search '{name}' already exists", "SKIP")
@@ -456,27 +699,29 @@ class AzureAIFoundryDeployer:
                 "--name",
                 name,
                 "--resource-group",
-                self.config["resource_group"],
+                self.config.resource_group,
                 "--location",
-                self.config["location"],
+                self.config.location,
                 "--sku",
                 "standard",
                 "--tags",
-                f"project={self.config['project_tag']}",
+                f"project={self.config.project_tag}",
+                "--no-wait",
             ]
         )
 
-        if result:
-            self.log(
-                f"Cognitive Search '{name}' created successfully", "SUCCESS"
-            )
+        if result is not None:
+            self.log(f"Cognitive Search '{name}' creation started", "SUCCESS")
             self.created_resources.append(f"Cognitive Search: {name}")
+            self.pending_resources.append(
+                ("search", name, f"Cognitive Search '{name}'")
+            )
             return True
         return False
 
     def create_key_vault(self) -> bool:
         """Create Key Vault"""
-        name = self.config["keyvault_name"]
+        name = self.config.keyvault_name
 
         if self.resource_exists("keyvault", name):
             self.log(f"Key Vault '{name}' already exists", "SKIP")
@@ -491,13 +736,13 @@ class AzureAIFoundryDeployer:
                 "--name",
                 name,
                 "--resource-group",
-                self.config["resource_group"],
+                self.config.resource_group,
                 "--location",
-                self.config["location"],
+                self.config.location,
                 "--sku",
                 "standard",
                 "--tags",
-                f"project={self.config['project_tag']}",
+                f"project={self.config.project_tag}",
             ]
         )
 
@@ -513,16 +758,16 @@ class AzureAIFoundryDeployer:
             (
                 "appconfig",
                 "App Configuration",
-                self.config["appconfig_name"],
+                self.config.appconfig_name,
                 [
                     "appconfig",
                     "create",
                     "--name",
-                    self.config["appconfig_name"],
+                    self.config.appconfig_name,
                     "--resource-group",
-                    self.config["resource_group"],
+                    self.config.resource_group,
                     "--location",
-                    self.config["location"],
+                    self.config.location,
                     "--sku",
                     "free",
                 ],
@@ -530,33 +775,34 @@ class AzureAIFoundryDeployer:
             (
                 "loganalytics",
                 "Log Analytics",
-                self.config["log_workspace_name"],
+                self.config.log_workspace_name,
                 [
                     "monitor",
                     "log-analytics",
                     "workspace",
                     "create",
                     "--workspace-name",
-                    self.config["log_workspace_name"],
+                    self.config.log_workspace_name,
                     "--resource-group",
-                    self.config["resource_group"],
+                    self.config.resource_group,
                     "--location",
-                    self.config["location"],
+                    self.config.location,
+                    "--no-wait",
                 ],
             ),
             (
                 "acr",
                 "Container Registry",
-                self.config["container_registry_name"],
+                self.config.container_registry_name,
                 [
                     "acr",
                     "create",
                     "--name",
-                    self.config["container_registry_name"],
+                    self.config.container_registry_name,
                     "--resource-group",
-                    self.config["resource_group"],
+                    self.config.resource_group,
                     "--location",
-                    self.config["location"],
+                    self.config.location,
                     "--sku",
                     "Basic",
                 ],
@@ -564,45 +810,67 @@ class AzureAIFoundryDeployer:
             (
                 "storage",
                 "Storage Account",
-                self.config["storage_account_name"],
+                self.config.storage_account_name,
                 [
                     "storage",
                     "account",
                     "create",
                     "--name",
-                    self.config["storage_account_name"],
+                    self.config.storage_account_name,
                     "--resource-group",
-                    self.config["resource_group"],
+                    self.config.resource_group,
                     "--location",
-                    self.config["location"],
+                    self.config.location,
                     "--sku",
                     "Standard_LRS",
                 ],
             ),
         ]
 
-        success = True
-        for resource_type, display_name, name, command in resources:
-            if self.resource_exists(resource_type, name):
-                self.log(f"{display_name} '{name}' already exists", "SKIP")
-                self.existing_resources.append(f"{display_name}: {name}")
-            else:
-                self.log(f"Creating {display_name}: {name}", "CREATE")
-                result = self.run_az_command(command)
-                if result:
-                    self.log(
-                        f"{display_name} '{name}' created successfully",
-                        "SUCCESS",
-                    )
-                    self.created_resources.append(f"{display_name}: {name}")
-                else:
-                    success = False
+        with ThreadPoolExecutor(max_workers=len(resources)) as executor:
+            results = list(
+                executor.map(
+                    lambda resource: self.create_supporting_resource(
+                        *resource
+                    ),
+                    resources,
+                )
+            )
+        return all(results)
 
-        return success
+    def create_supporting_resource(
+        self,
+        resource_type: str,
+        display_name: str,
+        name: str,
+        command: List[str],
+    ) -> bool:
+        """Create one supporting resource if it doesn't exist"""
+        if self.resource_exists(resource_type, name):
+            self.log(f"{display_name} '{name}' already exists", "SKIP")
+            self.existing_resources.append(f"{display_name}: {name}")
+            return True
+
+        self.log(f"Creating {display_name}: {name}", "CREATE")
+        result = self.run_az_command(command)
+        if result is None:
+            return False
+
+        if "--no-wait" in command:
+            self.log(f"{display_name} '{name}' creation started", "SUCCESS")
+            self.pending_resources.append(
+                (resource_type, name, f"{display_name} '{name}'")
+            )
+        else:
+            self.log(
+                f"{display_name} '{name}' created successfully", "SUCCESS"
+            )
+        self.created_resources.append(f"{display_name}: {name}")
+        return True
 
     def create_application_insights(self) -> bool:
         """Create Application Insights"""
-        name = self.config["application_insights_name"]
+        name = self.config.application_insights_name
 
         if self.resource_exists("appinsights", name):
             self.log(f"Application Insights '{name}' already exists", "SKIP")
@@ -619,13 +887,13 @@ class AzureAIFoundryDeployer:
                 "--app",
                 name,
                 "--resource-group",
-                self.config["resource_group"],
+                self.config.resource_group,
                 "--location",
-                self.config["location"],
+                self.config.location,
                 "--kind",
                 "web",
                 "--tags",
-                f"project={self.config['project_tag']}",
+                f"project={self.config.project_tag}",
             ]
         )
 
@@ -640,24 +908,10 @@ class AzureAIFoundryDeployer:
 
     def create_ml_workspace(self) -> bool:
         """Create ML Workspace for AI Foundry using existing resources"""
-        name = self.config["ml_workspace_name"]
+        name = self.config.ml_workspace_name
 
-        # Check if ML extension is installed
         if not self.dry_run:
-            try:
-                subprocess.run(
-                    ["az", "extension", "show", "--name", "ml"],
-                    capture_output=True,
-                    check=True,
-                    shell=True,
-                )
-            except subprocess.CalledProcessError:
-                self.log("Installing Azure ML extension...", "INFO")
-                subprocess.run(
-                    ["az", "extension", "add", "--name", "ml"],
-                    check=True,
-                    shell=True,
-                )
+            self.ensure_ml_extension()
 
         if self.resource_exists("ml", name):
             self.log(f"ML Workspace '{name}' already exists", "SKIP")
@@ -669,24 +923,24 @@ class AzureAIFoundryDeployer:
         )
 
         # Get resource IDs for existing shared resources
-        resource_group = self.config["resource_group"]
+        resource_group = self.config.resource_group
         subscription_id = self.get_subscription_id()
 
         # Build resource IDs
         storage_id = (
             f"/subscriptions/{subscription_id}/resourceGroups/"
             f"{resource_group}/providers/Microsoft.Storage/storageAccounts/"
-            f"{self.config['storage_account_name']}"
+            f"{self.config.storage_account_name}"
         )
         keyvault_id = (
             f"/subscriptions/{subscription_id}/resourceGroups/"
             f"{resource_group}/providers/Microsoft.KeyVault/vaults/"
-            f"{self.config['keyvault_name']}"
+            f"{self.config.keyvault_name}"
         )
         appinsights_id = (
             f"/subscriptions/{subscription_id}/resourceGroups/"
             f"{resource_group}/providers/Microsoft.Insights/components/"
-            f"{self.config['application_insights_name']}"
+            f"{self.config.application_insights_name}"
         )
 
         result = self.run_az_command(
@@ -697,9 +951,9 @@ class AzureAIFoundryDeployer:
                 "--name",
                 name,
                 "--resource-group",
-                self.config["resource_group"],
+                self.config.resource_group,
                 "--location",
-                self.config["location"],
+                self.config.location,
                 "--storage-account",
                 storage_id,
                 "--key-vault",
@@ -707,7 +961,7 @@ class AzureAIFoundryDeployer:
                 "--application-insights",
                 appinsights_id,
                 "--tags",
-                f"project={self.config['project_tag']}",
+                f"project={self.config.project_tag}",
             ]
         )
 
@@ -720,10 +974,36 @@ class AzureAIFoundryDeployer:
             return True
         return False
 
+    def ensure_ml_extension(self) -> None:
+        """Install the Azure ML CLI extension if it is missing"""
+        if AzureAIFoundryDeployer.ml_extension_ready:
+            return
+
+        # Installed extensions live in their own directory, which is far
+        # cheaper to look for than starting az to ask
+        config_dir = os.getenv("AZURE_CONFIG_DIR") or Path.home() / ".azure"
+        extension_dir = os.getenv("AZURE_EXTENSION_DIR") or Path(
+            config_dir, "cliextensions"
+        )
+        if not Path(extension_dir, "ml").is_dir():
+            try:
+                subprocess.run(
+                    [AZ_CLI, "extension", "show", "--name", "ml"],
+                    capture_output=True,
+                    check=True,
+                )
+            except subprocess.CalledProcessError:
+                self.log("Installing Azure ML extension...", "INFO")
+                subprocess.run(
+                    [AZ_CLI, "extension", "add", "--name", "ml"],
+                    check=True,
+                )
+        AzureAIFoundryDeployer.ml_extension_ready = True
+
     def create_app_service(self) -> bool:
         """Create App Service Plan and Web App"""
-        plan_name = self.config["app_service_plan_name"]
-        webapp_name = self.config["web_app_name"]
+        plan_name = self.config.app_service_plan_name
+        webapp_name = self.config.web_app_name
 
         # Create App Service Plan
         if self.resource_exists("appservice-plan", plan_name):
@@ -739,9 +1019,9 @@ class AzureAIFoundryDeployer:
                     "--name",
                     plan_name,
                     "--resource-group",
-                    self.config["resource_group"],
+                    self.config.resource_group,
                     "--location",
-                    self.config["location"],
+                    self.config.location,
                     "--sku",
                     "F1",
                     "--is-linux",
@@ -767,7 +1047,7 @@ class AzureAIFoundryDeployer:
                     "--name",
                     webapp_name,
                     "--resource-group",
-                    self.config["resource_group"],
+                    self.config.resource_group,
                     "--plan",
                     plan_name,
                     "--runtime",
@@ -786,44 +1066,69 @@ class AzureAIFoundryDeployer:
         """Get current subscription ID"""
         if self.dry_run:
             return "subscription-id"
-
-        try:
-            result = subprocess.run(
-                ["az", "account", "show", "--query", "id", "-o", "tsv"],
-                capture_output=True,
-                text=True,
-                check=True,
-                shell=True,
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError:
-            return "unknown"
+        # Always the active az subscription, which is where the az
+        # commands create resources; AZURE_SUBSCRIPTION_ID only guards it
+        if self.subscription_id is None:
+            self.load_account_ids()
+        return self.subscription_id or "unknown"
 
     def get_current_user_object_id(self) -> str:
         """Get current user's object ID"""
         if self.dry_run:
             return "user-object-id"
+        if self.user_object_id is None:
+            self.load_account_ids()
+        return self.user_object_id or "unknown"
+
+    def load_account_ids(self) -> bool:
+        """Look up the account IDs in one az call; False if not logged in"""
+        with self.account_lock:
+            if self.account_ids_loaded:
+                return self.logged_in
+            self.account_ids_loaded = True
+
+            # The ARM access token names the subscription, and its claims
+            # carry the signed-in principal's object ID, which saves
+            # separate 'account show' and 'ad signed-in-user show' calls.
+            # It is fetched for real in dry runs too, as the login check.
+            result = self.run_az_command(
+                ["account", "get-access-token"], check_exists=True
+            )
+            self.logged_in = result is not None
+            self.subscription_id = (
+                self.get_dict_value(result, "subscription") or None
+            )
+            claims = self.token_claims(
+                self.get_dict_value(result, "accessToken")
+            )
+            self.user_object_id = str(claims.get("oid", "")) or None
+            return self.logged_in
+
+    def subscription_matches(self) -> bool:
+        """Check AZURE_SUBSCRIPTION_ID, if set, is the active subscription"""
+        # az always works in its active subscription, so the variable can
+        # only guard against deploying into the wrong one
+        expected = os.getenv("AZURE_SUBSCRIPTION_ID", "").strip()
+        active = self.subscription_id or ""
+        if not expected or expected.lower() == active.lower():
+            return True
+        self.log(
+            f"AZURE_SUBSCRIPTION_ID is {expected}, but az is using "
+            f"subscription {active or 'unknown'}",
+            "ERROR",
+        )
+        return False
 
+    def token_claims(self, token: str) -> Dict[str, Any]:
+        """Decode the claims of a JWT without verifying it"""
         try:
-            result = subprocess.run(
-                [
-                    "az",
-                    "ad",
-                    "signed-in-user",
-                    "show",
-                    "--query",
-                    "id",
-                    "-o",
-                    "tsv",
-                ],
-                capture_output=True,
-                text=True,
-                check=True,
-                shell=True,
+            payload = token.split(".")[1]
+            claims = orjson.loads(
+                base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
             )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError:
-            return "unknown"
+        except (IndexError, ValueError):
+            return {}
+        return claims if isinstance(claims, dict) else {}
 
     def assign_role_to_user(
         self,
@@ -890,18 +1195,12 @@ class AzureAIFoundryDeployer:
                     "--name",
                     name,
                     "--resource-group",
-                    self.config["resource_group"],
+                    self.config.resource_group,
                     "--query",
-                    "principalId",
-                    "-o",
-                    "tsv",
+                    "{principalId: principalId}",
                 ]
             )
-            return (
-                identity_info.strip()
-                if isinstance(identity_info, str)
-                else None
-            )
+            return self.get_dict_value(identity_info, "principalId") or None
 
         self.log(f"Creating Managed Identity: {name}", "CREATE")
         result = self.run_az_command(
@@ -911,11 +1210,11 @@ class AzureAIFoundryDeployer:
                 "--name",
                 name,
                 "--resource-group",
-                self.config["resource_group"],
+                self.config.resource_group,
                 "--location",
-                self.config["location"],
+                self.config.location,
                 "--tags",
-                f"project={self.config['project_tag']}",
+                f"project={self.config.project_tag}",
             ]
         )
 
@@ -935,7 +1234,7 @@ class AzureAIFoundryDeployer:
 
         # Get current user's object ID
         user_object_id = self.get_current_user_object_id()
-        resource_group = self.config["resource_group"]
+        resource_group = self.config.resource_group
         subscription_id = self.get_subscription_id()
 
         # Define resource scopes
@@ -944,27 +1243,25 @@ class AzureAIFoundryDeployer:
 
         openai_scope = (
             f"{rg_path}/providers/Microsoft.CognitiveServices/"
-            f"accounts/{self.config['openai_service_name']}"
+            f"accounts/{self.config.openai_service_name}"
         )
         ai_services_scope = (
             f"{rg_path}/providers/Microsoft.CognitiveServices/"
-            f"accounts/{self.config['ai_services_name']}"
+            f"accounts/{self.config.ai_services_name}"
         )
         search_scope = (
             f"{rg_path}/providers/Microsoft.Search/"
-            f"searchServices/{self.config['cognitive_search_name']}"
+            f"searchServices/{self.config.cognitive_search_name}"
         )
         keyvault_scope = (
             f"{rg_path}/providers/Microsoft.KeyVault/"
-            f"vaults/{self.config['keyvault_name']}"
+            f"vaults/{self.config.keyvault_name}"
         )
         storage_scope = (
             f"{rg_path}/providers/Microsoft.Storage/"
-            f"storageAccounts/{self.config['storage_account_name']}"
+            f"storageAccounts/{self.config.storage_account_name}"
         )
 
-        success = True
-
         # 1. Give current user permissions to manage services
         user_roles = [
             ("Cognitive Services OpenAI User", openai_scope),
@@ -974,39 +1271,54 @@ class AzureAIFoundryDeployer:
             ("Storage Blob Data Contributor", storage_scope),
         ]
 
-        for role, scope in user_roles:
-            if not self.assign_role_to_user(role, scope, user_object_id):
-                success = False
-
-        # 2. Create managed identity for applications
-        app_identity_name = f"id-{self.config['project_tag']}-apps"
-        app_principal_id = self.create_managed_identity(app_identity_name)
-
-        if app_principal_id:
-            # 3. Give applications access to AI services
-            app_roles = [
-                ("Cognitive Services OpenAI User", openai_scope),
-                ("Cognitive Services User", ai_services_scope),
-                ("Search Index Data Reader", search_scope),
-                ("Key Vault Secrets User", keyvault_scope),
-                ("Storage Blob Data Reader", storage_scope),
+        # Role assignments are independent of each other, and the user's
+        # can be made while the application identity is being created
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_COMMANDS) as executor:
+            assignments = [
+                executor.submit(
+                    self.assign_role_to_user, role, scope, user_object_id
+                )
+                for role, scope in user_roles
             ]
 
-            for role, scope in app_roles:
-                if not self.assign_role_to_user(
-                    role, scope, app_principal_id, is_service_principal=True
-                ):
-                    success = False
+            # 2. Create managed identity for applications
+            app_identity_name = f"id-{self.config.project_tag}-apps"
+            app_principal_id = executor.submit(
+                self.create_managed_identity, app_identity_name
+            ).result()
+
+            if app_principal_id:
+                # 3. Give applications access to AI services
+                app_roles = [
+                    ("Cognitive Services OpenAI User", openai_scope),
+                    ("Cognitive Services User", ai_services_scope),
+                    ("Search Index Data Reader", search_scope),
+                    ("Key Vault Secrets User", keyvault_scope),
+                    ("Storage Blob Data Reader", storage_scope),
+                ]
 
-            # Store the managed identity info for applications to use
-            self.config["app_managed_identity_name"] = app_identity_name
-            self.config["app_managed_identity_principal_id"] = app_principal_id
+                assignments += [
+                    executor.submit(
+                        self.assign_role_to_user,
+                        role,
+                        scope,
+                        app_principal_id,
+                        is_service_principal=True,
+                    )
+                    for role, scope in app_roles
+                ]
+
+                # Store the managed identity info for applications to use
+                self.app_identity_name = app_identity_name
+                self.app_identity_principal_id = app_principal_id
+
+            success = all([future.result() for future in assignments])
 
         return success
 
     def store_secrets_in_keyvault(self) -> bool:
         """Store ALL configuration values and secrets in Key Vault"""
-        keyvault_name = self.config["keyvault_name"]
+        keyvault_name = self.config.keyvault_name
 
         if self.dry_run:
             self.log(
@@ -1016,275 +1328,387 @@ class AzureAIFoundryDeployer:
 
         self.log("Retrieving service details for Key Vault storage...", "INFO")
 
-        # Get OpenAI service details
-        openai_info = self.run_az_command(
-            [
+        # Prepare ALL configuration values (secrets + non-secrets); a
+        # fetched endpoint replaces the conventional one it defaults to
+        all_config = self.static_config()
+        for secret_name, secret_value in self.fetch_service_config().items():
+            if secret_value or secret_name not in all_config:
+                all_config[secret_name] = secret_value
+
+        self.log("Storing complete configuration in Key Vault...", "CREATE")
+        total_count = len(all_config)
+        for secret_name, secret_value in all_config.items():
+            if not secret_value:  # Only store non-empty values
+                self.log(f"  ⚠ Skipped empty value: {secret_name}", "WARNING")
+
+        # Values Key Vault already holds are not written again, which
+        # would only add a new version of the secret
+        hash_key = self.load_secret_hash_key()
+        stored_hashes = self.stored_secret_hashes(keyvault_name)
+        candidates = [
+            (name, value, self.secret_hash(hash_key, value))
+            for name, value in all_config.items()
+            if value
+        ]
+        to_store = [
+            item
+            for item in candidates
+            if stored_hashes.get(item[0]) != item[2]
+        ]
+        unchanged_count = len(candidates) - len(to_store)
+
+        # Each secret is its own az process and Key Vault write; they are
+        # independent, so a few run at once
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_COMMANDS) as executor:
+            stored_count = sum(
+                executor.map(
+                    lambda item: self.set_secret(keyvault_name, *item),
+                    to_store,
+                )
+            )
+
+        self.log(
+            f"Stored {stored_count}/{len(to_store)} changed configuration "
+            f"values in Key Vault",
+            "SUCCESS",
+        )
+        if unchanged_count:
+            self.log(
+                f"{unchanged_count}/{total_count} values were already up to "
+                f"date",
+                "SKIP",
+            )
+        success_count = stored_count + unchanged_count
+
+        # Display what other scripts need
+        self.log("Other scripts only need this in their .env:", "INFO")
+        self.log(f"KEYVAULT_NAME={keyvault_name}", "INFO")
+        self.log(
+            "All other configuration will be retrieved from Key Vault "
+            "automatically",
+            "INFO",
+        )
+
+        return success_count > 0
+
+    def static_config(self) -> Dict[str, str]:
+        """Configuration values that follow from resource names alone"""
+        ai_services_name = self.config.ai_services_name
+        project_tag = self.config.project_tag
+        openai_name = self.config.openai_service_name
+        search_name = self.config.cognitive_search_name
+        location = self.config.location
+        keyvault_name = self.config.keyvault_name
+        storage_name = self.config.storage_account_name
+        registry_name = self.config.container_registry_name
+        appconfig_name = self.config.appconfig_name
+        web_app_name = self.config.web_app_name
+        config = {
+            # === AI FOUNDRY PROJECT ===
+            "ai-foundry-project-endpoint": (
+                f"https://{ai_services_name}.services.ai.azure.com/"
+                f"api/projects/{project_tag}"
+            ),
+            # === OPENAI SERVICE (Primary AI) ===
+            "ai-services-endpoint": f"https://{openai_name}.openai.azure.com/",
+            "ai-services-name": openai_name,
+            # === GENERAL AI SERVICES ===
+            "general-ai-services-endpoint": (
+                f"https://{ai_services_name}.cognitiveservices.azure.com/"
+            ),
+            "general-ai-services-name": ai_services_name,
+            # === COGNITIVE SEARCH ===
+            "cognitive-search-endpoint": (
+                f"https://{search_name}.search.windows.net/"
+            ),
+            "cognitive-search-name": search_name,
+            # === SPEECH SERVICES ===
+            "speechtotext-endpoint": (
+                f"https://{location}.stt.speech.microsoft.com"
+            ),
+            "texttospeech-endpoint": (
+                f"https://{location}.tts.speech.microsoft.com"
+            ),
+            # === KEY VAULT ===
+            "keyvault-name": keyvault_name,
+            "keyvault-uri": f"https://{keyvault_name}.vault.azure.net/",
+            # === STORAGE ACCOUNT ===
+            "storage-account-name": storage_name,
+            "storage-blob-endpoint": (
+                f"https://{storage_name}.blob.core.windows.net/"
+            ),
+            # === APPLICATION INSIGHTS ===
+            "application-insights-name": self.config.application_insights_name,
+            # === CONTAINER REGISTRY ===
+            "container-registry-name": registry_name,
+            "container-registry-server": f"{registry_name}.azurecr.io",
+            # === APP CONFIGURATION ===
+            "app-config-name": appconfig_name,
+            "app-config-endpoint": f"https://{appconfig_name}.azconfig.io",
+            # === LOG ANALYTICS ===
+            "log-workspace-name": self.config.log_workspace_name,
+            # === ML WORKSPACE ===
+            "ml-workspace-name": self.config.ml_workspace_name,
+            # === RESOURCE GROUP & LOCATION ===
+            "resource-group": self.config.resource_group,
+            "location": location,
+            "project-tag": project_tag,
+            # === APPLICATION SETTINGS ===
+            "api-base-url": f"https://{web_app_name}.azurewebsites.net",
+            "openapi-spec-url": (
+                f"https://{web_app_name}.azurewebsites.net/openapi.json"
+            ),
+            "web-app-name": web_app_name,
+        }
+        config.update(FIXED_CONFIG)
+        return config
+
+    def fetch_service_config(self) -> Dict[str, str]:
+        """Fetch the endpoints and keys of the deployed services"""
+        # The lookups are independent reads, so they run concurrently
+        resource_group = self.config.resource_group
+        openai_name = self.config.openai_service_name
+        ai_services = self.config.ai_services_name
+        search_name = self.config.cognitive_search_name
+        # Each lookup projects just the fields used below
+        lookups = {
+            # Get OpenAI service details
+            "openai_info": [
                 "cognitiveservices",
                 "account",
                 "show",
                 "--name",
-                self.config["openai_service_name"],
+                openai_name,
                 "--resource-group",
-                self.config["resource_group"],
-            ]
-        )
-
-        openai_keys = self.run_az_command(
-            [
+                resource_group,
+                "--query",
+                "{endpoint: properties.endpoint}",
+            ],
+            "openai_keys": [
                 "cognitiveservices",
                 "account",
                 "keys",
                 "list",
                 "--name",
-                self.config["openai_service_name"],
+                openai_name,
                 "--resource-group",
-                self.config["resource_group"],
-            ]
-        )
-
-        # Get General AI Services details
-        general_ai_info = self.run_az_command(
-            [
+                resource_group,
+                "--query",
+                "{key1: key1}",
+            ],
+            # Get General AI Services details
+            "general_ai_info": [
                 "cognitiveservices",
                 "account",
                 "show",
                 "--name",
-                self.config["ai_services_name"],
+                ai_services,
                 "--resource-group",
-                self.config["resource_group"],
-            ]
-        )
-
-        general_ai_keys = self.run_az_command(
-            [
+                resource_group,
+                "--query",
+                "{endpoint: properties.endpoint}",
+            ],
+            "general_ai_keys": [
                 "cognitiveservices",
                 "account",
                 "keys",
                 "list",
                 "--name",
-                self.config["ai_services_name"],
+                ai_services,
                 "--resource-group",
-                self.config["resource_group"],
-            ]
-        )
-
-        # Get Cognitive Search details
-        search_keys = self.run_az_command(
-            [
+                resource_group,
+                "--query",
+                "{key1: key1}",
+            ],
+            # Get Cognitive Search details
+            "search_keys": [
                 "search",
                 "admin-key",
                 "show",
                 "--service-name",
-                self.config["cognitive_search_name"],
+                search_name,
                 "--resource-group",
-                self.config["resource_group"],
-            ]
-        )
-
-        search_query_keys_result = self.run_az_command(
-            [
+                resource_group,
+                "--query",
+                "{primaryKey: primaryKey}",
+            ],
+            "search_query_keys": [
                 "search",
                 "query-key",
                 "list",
                 "--service-name",
-                self.config["cognitive_search_name"],
+                search_name,
                 "--resource-group",
-                self.config["resource_group"],
-            ]
-        )
-        search_query_keys = (
-            search_query_keys_result
-            if isinstance(search_query_keys_result, list)
-            else []
-        )
-
-        # Get Storage Account details
-        storage_keys_result = self.run_az_command(
-            [
+                resource_group,
+                "--query",
+                "[:1].{key: key}",
+            ],
+            # Get Storage Account details
+            "storage_keys": [
                 "storage",
                 "account",
                 "keys",
                 "list",
                 "--account-name",
-                self.config["storage_account_name"],
+                self.config.storage_account_name,
                 "--resource-group",
-                self.config["resource_group"],
-            ]
-        )
-        storage_keys = (
-            storage_keys_result
-            if isinstance(storage_keys_result, list)
-            else []
-        )
-
-        # Get Application Insights details
-        appinsights_info = self.run_az_command(
-            [
+                resource_group,
+                "--query",
+                "[:1].{value: value}",
+            ],
+            # Get Application Insights details
+            "appinsights_info": [
                 "monitor",
                 "app-insights",
                 "component",
                 "show",
                 "--app",
-                self.config["application_insights_name"],
+                self.config.application_insights_name,
                 "--resource-group",
-                self.config["resource_group"],
-            ]
+                resource_group,
+                "--query",
+                "{instrumentationKey: instrumentationKey,"
+                " connectionString: connectionString}",
+            ],
+        }
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_COMMANDS) as executor:
+            info = dict(
+                zip(
+                    lookups,
+                    executor.map(
+                        lambda command: self.run_az_command(
+                            command, cached=True
+                        ),
+                        lookups.values(),
+                    ),
+                )
+            )
+
+        openai_info = info["openai_info"]
+        openai_keys = info["openai_keys"]
+        general_ai_info = info["general_ai_info"]
+        general_ai_keys = info["general_ai_keys"]
+        search_keys = info["search_keys"]
+        search_query_keys = (
+            info["search_query_keys"]
+            if isinstance(info["search_query_keys"], list)
+            else []
+        )
+        storage_keys = (
+            info["storage_keys"]
+            if isinstance(info["storage_keys"], list)
+            else []
         )
+        appinsights_info = info["appinsights_info"]
 
-        # Prepare ALL configuration values (secrets + non-secrets)
-        ai_services_name = self.config["ai_services_name"]
-        project_tag = self.config["project_tag"]
-        all_config: Dict[str, str] = {
-            # === AI FOUNDRY PROJECT ===
-            "ai-foundry-project-endpoint": (
-                f"https://{ai_services_name}.services.ai.azure.com/"
-                f"api/projects/{project_tag}"
-            ),
+        return {
             # === OPENAI SERVICE (Primary AI) ===
-            "ai-services-endpoint": (
-                self.get_dict_value(openai_info, "properties.endpoint")
-                or f"https://{self.config['openai_service_name']}"
-                f".openai.azure.com/"
+            "ai-services-endpoint": self.get_dict_value(
+                openai_info, "endpoint"
             ),
             "ai-services-key": self.get_dict_value(openai_keys, "key1"),
-            "ai-services-name": self.config["openai_service_name"],
             # === GENERAL AI SERVICES ===
-            "general-ai-services-endpoint": (
-                self.get_dict_value(general_ai_info, "properties.endpoint")
-                or f"https://{ai_services_name}.cognitiveservices.azure.com/"
+            "general-ai-services-endpoint": self.get_dict_value(
+                general_ai_info, "endpoint"
             ),
             "general-ai-services-key": self.get_dict_value(
                 general_ai_keys, "key1"
             ),
-            "general-ai-services-name": self.config["ai_services_name"],
             # === COGNITIVE SEARCH ===
-            "cognitive-search-endpoint": (
-                f"https://{self.config['cognitive_search_name']}"
-                f".search.windows.net/"
-            ),
             "cognitive-search-admin-key": self.get_dict_value(
                 search_keys, "primaryKey"
             ),
             "cognitive-search-query-key": self.get_list_item_value(
                 search_query_keys, 0, "key"
             ),
-            "cognitive-search-name": self.config["cognitive_search_name"],
-            # === SPEECH SERVICES ===
-            "speechtotext-endpoint": (
-                f"https://{self.config['location']}.stt.speech.microsoft.com"
-            ),
-            "texttospeech-endpoint": (
-                f"https://{self.config['location']}.tts.speech.microsoft.com"
-            ),
-            # === TRANSLATOR ===
-            "translator-endpoint": (
-                "https://api.cognitive.microsofttranslator.com/"
-            ),
-            # === KEY VAULT ===
-            "keyvault-name": self.config["keyvault_name"],
-            "keyvault-uri": (
-                f"https://{self.config['keyvault_name']}.vault.azure.net/"
-            ),
             # === STORAGE ACCOUNT ===
-            "storage-account-name": self.config["storage_account_name"],
             "storage-account-key": self.get_list_item_value(
                 storage_keys, 0, "value"
             ),
-            "storage-blob-endpoint": (
-                f"https://{self.config['storage_account_name']}"
-                f".blob.core.windows.net/"
-            ),
             # === APPLICATION INSIGHTS ===
-            "application-insights-name": self.config[
-                "application_insights_name"
-            ],
             "application-insights-instrumentation-key": self.get_dict_value(
                 appinsights_info, "instrumentationKey"
             ),
             "application-insights-connection-string": self.get_dict_value(
                 appinsights_info, "connectionString"
             ),
-            # === CONTAINER REGISTRY ===
-            "container-registry-name": self.config["container_registry_name"],
-            "container-registry-server": (
-                f"{self.config['container_registry_name']}.azurecr.io"
-            ),
-            # === APP CONFIGURATION ===
-            "app-config-name": self.config["appconfig_name"],
-            "app-config-endpoint": (
-                f"https://{self.config['appconfig_name']}.azconfig.io"
-            ),
-            # === LOG ANALYTICS ===
-            "log-workspace-name": self.config["log_workspace_name"],
-            # === ML WORKSPACE ===
-            "ml-workspace-name": self.config["ml_workspace_name"],
-            # === RESOURCE GROUP & LOCATION ===
-            "resource-group": self.config["resource_group"],
-            "location": self.config["location"],
-            "project-tag": self.config["project_tag"],
-            # === APPLICATION SETTINGS ===
-            "api-base-url": (
-                f"https://{self.config['web_app_name']}.azurewebsites.net"
-            ),
-            "openapi-spec-url": (
-                f"https://{self.config['web_app_name']}"
-                f".azurewebsites.net/openapi.json"
-            ),
-            "web-app-name": self.config["web_app_name"],
-            # === AZURE OPENAI CONFIGURATION ===
-            "azure-openai-api-version": "2024-02-01",
-            "azure-openai-deployment-gpt": "gpt-4o-mini",
-            "azure-openai-deployment-embedding": "text-embedding-ada-002",
-            "azure-openai-deployment-whisper": "whisper",
-            "azure-openai-deployment-tts": "tts-1",
-            # === APPLICATION SECRETS ===
-            "flask-secret-key": (
-                "your-secure-secret-key-change-this-in-production"
-            ),
         }
 
-        self.log("Storing complete configuration in Key Vault...", "CREATE")
-        success_count = 0
-        total_count = len(all_config)
-
-        for secret_name, secret_value in all_config.items():
-            if secret_value:  # Only store non-empty values
-                result = self.run_az_command(
-                    [
-                        "keyvault",
-                        "secret",
-                        "set",
-                        "--vault-name",
-                        keyvault_name,
-                        "--name",
-                        secret_name,
-                        "--value",
-                        str(secret_value),
-                    ]
-                )
-                if result:
-                    success_count += 1
-                    if self.verbose:
-                        self.log(f"  ✓ Stored: {secret_name}", "SUCCESS")
-            else:
-                self.log(f"  ⚠ Skipped empty value: {secret_name}", "WARNING")
+    def load_secret_hash_key(self) -> bytes:
+        """Read the local key for secret hashes, creating it on first use"""
+        try:
+            return Path(SECRET_HASH_KEY_FILE).read_bytes()
+        except FileNotFoundError:
+            key = secrets.token_bytes(32)
 
-        self.log(
-            f"Stored {success_count}/{total_count} configuration values "
-            f"in Key Vault",
-            "SUCCESS",
+        # Without a saved key the next run writes every value again
+        try:
+            fd = os.open(
+                SECRET_HASH_KEY_FILE,
+                os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+                0o600,
+            )
+            with os.fdopen(fd, "wb") as key_file:
+                key_file.write(key)
+        except OSError as e:
+            self.log(f"Could not save {SECRET_HASH_KEY_FILE}: {e}", "WARNING")
+        return key
+
+    def secret_hash(self, key: bytes, secret_value: str) -> str:
+        """Keyed hash of a secret value for the SECRET_HASH_TAG tag"""
+        return hmac.new(
+            key, str(secret_value).encode(), hashlib.sha256
+        ).hexdigest()
+
+    def stored_secret_hashes(self, keyvault_name: str) -> Dict[str, str]:
+        """Value hashes tagged on the secrets already in Key Vault"""
+        secrets_list = self.run_az_command(
+            [
+                "keyvault",
+                "secret",
+                "list",
+                "--vault-name",
+                keyvault_name,
+                "--query",
+                f"[].{{name: name, hash: tags.{SECRET_HASH_TAG}}}",
+            ]
         )
+        if not isinstance(secrets_list, list):
+            return {}
+        return {
+            secret["name"]: secret["hash"]
+            for secret in secrets_list
+            if secret.get("name") and secret.get("hash")
+        }
 
-        # Display what other scripts need
-        self.log("Other scripts only need this in their .env:", "INFO")
-        self.log(f"KEYVAULT_NAME={keyvault_name}", "INFO")
-        self.log(
-            "All other configuration will be retrieved from Key Vault "
-            "automatically",
-            "INFO",
+    def set_secret(
+        self,
+        keyvault_name: str,
+        secret_name: str,
+        secret_value: str,
+        value_hash: str,
+    ) -> bool:
+        """Store one value in Key Vault, tagged with its hash"""
+        result = self.run_az_command(
+            [
+                "keyvault",
+                "secret",
+                "set",
+                "--vault-name",
+                keyvault_name,
+                "--name",
+                secret_name,
+                "--value",
+                str(secret_value),
+                "--tags",
+                f"{SECRET_HASH_TAG}={value_hash}",
+            ]
         )
-
-        return success_count > 0
+        if not result:
+            return False
+        if self.verbose:
+            self.log(f"  ✓ Stored: {secret_name}", "SUCCESS")
+        return True
 
     def deploy(self, config_only: bool = False) -> bool:
         """Main deployment orchestration"""
@@ -1296,24 +1720,72 @@ class AzureAIFoundryDeployer:
             )
             return self.store_secrets_in_keyvault()
 
-        steps = [
-            ("Resource Group", self.create_resource_group),
-            ("General AI Services", self.create_general_ai_services),
-            ("OpenAI Service", self.create_openai_service),
-            ("Cognitive Search", self.create_cognitive_search),
-            ("Key Vault", self.create_key_vault),
-            ("Supporting Resources", self.create_supporting_resources),
-            ("Application Insights", self.create_application_insights),
-            ("ML Workspace", self.create_ml_workspace),
-            ("App Service", self.create_app_service),
-        ]
+        # Each step starts as soon as the steps it needs have finished;
+        # the ML workspace uses the storage account, Key Vault and
+        # Application Insights, everything else only the resource group
+        after_group = ["Resource Group"]
+        steps: Dict[str, Tuple[Callable[[], bool], List[str]]] = {
+            "Resource Group": (self.create_resource_group, []),
+            "General AI Services": (
+                self.create_general_ai_services,
+                after_group,
+            ),
+            "OpenAI Service": (self.create_openai_service, after_group),
+            "Cognitive Search": (self.create_cognitive_search, after_group),
+            "Key Vault": (self.create_key_vault, after_group),
+            "Supporting Resources": (
+                self.create_supporting_resources,
+                after_group,
+            ),
+            "Application Insights": (
+                self.create_application_insights,
+                after_group,
+            ),
+            "ML Workspace": (
+                self.create_ml_workspace,
+                ["Key Vault", "Supporting Resources", "Application Insights"],
+            ),
+            "App Service": (self.create_app_service, after_group),
+        }
 
         success = True
-        for step_name, step_func in steps:
-            self.log(f"Processing: {step_name}", "INFO")
-            if not step_func():
-                self.log(f"Failed to create {step_name}", "ERROR")
-                success = False
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_COMMANDS) as executor:
+            finished: Set[str] = set()
+            running: Dict[Future[bool], str] = {}
+            while len(finished) < len(steps):
+                for step_name, (step_func, needs) in steps.items():
+                    if (
+                        step_name not in finished
+                        and step_name not in running.values()
+                        and finished.issuperset(needs)
+                    ):
+                        self.log(f"Processing: {step_name}", "INFO")
+                        running[executor.submit(step_func)] = step_name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step_name = running.pop(future)
+                    finished.add(step_name)
+                    if not future.result():
+                        self.log(f"Failed to create {step_name}", "ERROR")
+                        success = False
+
+            # --no-wait creates have been provisioning alongside the later
+            # waves; permissions and secrets need them finished
+            pending = {
+                executor.submit(
+                    self.wait_for_provisioning,
+                    self.show_command(resource_type, name),
+                    display_name,
+                    NO_WAIT_TIMEOUT,
+                ): display_name
+                for resource_type, name, display_name in self.pending_resources
+            }
+            for future in as_completed(pending):
+                if future.result():
+                    self.log(f"{pending[future]} is ready", "SUCCESS")
+                else:
+                    success = False
 
         # Deploy default OpenAI models and verify general AI services
         if success and not self.dry_run:
@@ -1350,62 +1822,60 @@ class AzureAIFoundryDeployer:
 
         if not self.dry_run:
             print("\n🔧 CONFIGURATION:")
-            print(f"   • Resource Group: {self.config['resource_group']}")
-            print(f"   • Location: {self.config['location']}")
-            print(f"   • OpenAI Service: {self.config['openai_service_name']}")
-            print(f"   • Key Vault: {self.config['keyvault_name']}")
+            print(f"   • Resource Group: {self.config.resource_group}")
+            print(f"   • Location: {self.config.location}")
+            print(f"   • OpenAI Service: {self.config.openai_service_name}")
+            print(f"   • Key Vault: {self.config.keyvault_name}")
 
             print("\n🌐 ENDPOINTS:")
-            openai_service = self.config["openai_service_name"]
+            openai_service = self.config.openai_service_name
             openai_endpoint = f"https://{openai_service}.openai.azure.com/"
             print(f"   • OpenAI: {openai_endpoint}")
-            search_service = self.config["cognitive_search_name"]
+            search_service = self.config.cognitive_search_name
             search_endpoint = f"https://{search_service}.search.windows.net/"
             print(f"   • Search: {search_endpoint}")
-            kv_name = self.config["keyvault_name"]
+            kv_name = self.config.keyvault_name
             kv_endpoint = f"https://{kv_name}.vault.azure.net/"
             print(f"   • Key Vault: {kv_endpoint}")
 
         print("\n" + "=" * 60)
 
 
-def load_config() -> Dict[str, Any]:
+def load_config() -> DeployConfig:
     """Load configuration from environment or use defaults"""
-    return {
-        "resource_group": os.getenv("RESOURCE_GROUP", "rg-ai-nukesearch01"),
-        "location": os.getenv("LOCATION", "eastus2"),
-        "project_tag": os.getenv("PROJECT_TAG", "ai-nukesearch01"),
-        "ai_services_name": os.getenv(
+    return DeployConfig(
+        resource_group=os.getenv("RESOURCE_GROUP", "rg-ai-nukesearch01"),
+        location=os.getenv("LOCATION", "eastus2"),
+        project_tag=os.getenv("PROJECT_TAG", "ai-nukesearch01"),
+        ai_services_name=os.getenv(
             "AI_SERVICES_NAME", "aiserv-ai-nukesearch01"
         ),
-        "openai_service_name": os.getenv(
+        openai_service_name=os.getenv(
             "OPENAI_SERVICE_NAME", "openai-nukesearch01"
         ),
-        "cognitive_search_name": os.getenv(
+        cognitive_search_name=os.getenv(
             "COGNITIVE_SEARCH_NAME", "cog-ai-nukesearch01"
         ),
-        "keyvault_name": os.getenv("KEYVAULT_NAME", "kvainukesearch01"),
-        "appconfig_name": os.getenv("APPCONFIG_NAME", "ac-ai-nukesearch01"),
-        "log_workspace_name": os.getenv(
+        keyvault_name=os.getenv("KEYVAULT_NAME", "kvainukesearch01"),
+        appconfig_name=os.getenv("APPCONFIG_NAME", "ac-ai-nukesearch01"),
+        log_workspace_name=os.getenv(
             "LOG_WORKSPACE_NAME", "log-ai-nukesearch01"
         ),
-        "container_registry_name": os.getenv(
+        container_registry_name=os.getenv(
             "CONTAINER_REGISTRY_NAME", "crainukesearch01"
         ),
-        "storage_account_name": os.getenv(
+        storage_account_name=os.getenv(
             "STORAGE_ACCOUNT_NAME", "stainukesearch01"
         ),
-        "application_insights_name": os.getenv(
+        application_insights_name=os.getenv(
             "APPLICATION_INSIGHTS_NAME", "ai-ai-nukesearch01"
         ),
-        "ml_workspace_name": os.getenv(
-            "ML_WORKSPACE_NAME", "ml-ai-nukesearch01"
-        ),
-        "app_service_plan_name": os.getenv(
+        ml_workspace_name=os.getenv("ML_WORKSPACE_NAME", "ml-ai-nukesearch01"),
+        app_service_plan_name=os.getenv(
             "APP_SERVICE_PLAN_NAME", "asp-nukesearch01"
         ),
-        "web_app_name": os.getenv("WEB_APP_NAME", "nukesearch-rjglabs"),
-    }
+        web_app_name=os.getenv("WEB_APP_NAME", "nukesearch-rjglabs"),
+    )
 
 
 def main() -> None:
@@ -1432,23 +1902,27 @@ def main() -> None:
     # Load environment variables from .env file
     load_env_file()
 
+    # Every az process otherwise spawns a telemetry upload when it exits;
+    # an explicit setting in the environment or .env still wins
+    os.environ.setdefault("AZURE_CORE_COLLECT_TELEMETRY", "false")
+
     # Load configuration
     config = load_config()
 
     # Create deployer
     deployer = AzureAIFoundryDeployer(config, args.dry_run, args.verbose)
 
-    # Check Azure CLI authentication
-    try:
-        subprocess.run(
-            ["az", "account", "show"],
-            capture_output=True,
-            check=True,
-            shell=True,
-        )
-    except subprocess.CalledProcessError:
+    # Check Azure CLI authentication; the same call supplies the account
+    # IDs used later, so it is not repeated
+    if not deployer.load_account_ids():
         print("❌ Please log in to Azure CLI first: az login")
         sys.exit(1)
+    if not deployer.subscription_matches():
+        print(
+            "❌ Select the subscription first: "
+            "az account set --subscription <id>"
+        )
+        sys.exit(1)
 
     # Deploy
     success = deployer.deploy(config_only=args.config_only)